@@ -5,6 +5,7 @@ Saves and loads user preferences for Whispering application
 """
 
 import json
+import os
 from pathlib import Path
 from typing import Dict, Any
 
@@ -76,8 +77,15 @@ class Settings:
             self.settings = settings
 
         try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            # Serialise up front and hand the file one write; json.dump would
+            # push each token through the 8 KiB text buffer separately.
+            # Writing beside the target and swapping it in keeps a shutdown
+            # interrupted mid-write from leaving a truncated settings file.
+            data = json.dumps(self.settings, indent=2)
+            tmp_file = self.settings_file.with_name(self.settings_file.name + '.tmp')
+            with open(tmp_file, 'w') as f:
+                f.write(data)
+            os.replace(tmp_file, self.settings_file)
         except Exception as e:
             print(f"Error saving settings: {e}")
 
@@ -85,6 +93,11 @@ class Settings:
         """Get a setting value."""
         return self.settings.get(key, default)
 
+    def get_many(self, defaults: Dict[str, Any]) -> Dict[str, Any]:
+        """Get several settings at once, falling back to the given defaults."""
+        settings = self.settings
+        return {key: settings.get(key, default) for key, default in defaults.items()}
+
     def set(self, key: str, value: Any):
         """Set a setting value."""
         self.settings[key] = value
@@ -12,7 +12,7 @@ from nicegui import ui
 
 import core
 from cmque import DataDeque, PairDeque, Queue
-from whispering_ui.state import AppState
+from whispering_ui.state import AppState, get_ai_config
 from session_logger import SessionLogger
 
 # Voice command modules
@@ -424,10 +424,12 @@ class ProcessingBridge:
             return None
 
         try:
-            from ai_config import load_ai_config
             from ai_provider import AITextProcessor
 
-            ai_config = load_ai_config()
+            # Re-read the config on each start so edits to ai_config.yaml or
+            # the custom personas take effect without restarting the app
+            self.state.reload_ai_config()
+            ai_config = get_ai_config()
             if not ai_config:
                 return None
 
@@ -944,7 +946,7 @@ class ProcessingBridge:
             file_paths: List of audio file paths
         """
         valid_files = [p for p in file_paths if core.is_audio_file(p)]
-        self.state.file_transcription_paths.extend(valid_files)
+        self.state.file_transcription_paths = self.state.file_transcription_paths + valid_files
         return len(valid_files)
 
     def add_directory_for_transcription(self, directory_path: str, recursive: bool = False):
@@ -959,7 +961,7 @@ class ProcessingBridge:
         """
         try:
             files = core.get_audio_files_from_directory(directory_path, recursive)
-            self.state.file_transcription_paths.extend(files)
+            self.state.file_transcription_paths = self.state.file_transcription_paths + files
             return len(files)
         except Exception as e:
             self.state.error_message = f"Error scanning directory: {str(e)}"
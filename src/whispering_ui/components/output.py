@@ -128,7 +128,6 @@ def create_output_panels(state: AppState, bridge=None):
             'title': 'Whisper Output',
             'placeholder': 'Whisper transcription will appear here...',
             'state_attr': 'whisper_text',
-            'count_fn': state.get_whisper_count,
             'cut_type': 'whisper',
             'copy_label': 'Whisper',
         },
@@ -137,7 +136,6 @@ def create_output_panels(state: AppState, bridge=None):
             'title': 'AI Output',
             'placeholder': 'AI processed text will appear here...',
             'state_attr': 'ai_text',
-            'count_fn': state.get_ai_count,
             'cut_type': 'ai',
             'copy_label': 'AI',
         },
@@ -146,7 +144,6 @@ def create_output_panels(state: AppState, bridge=None):
             'title': 'Translation Output',
             'placeholder': 'Translation will appear here...',
             'state_attr': 'translation_text',
-            'count_fn': state.get_translation_count,
             'cut_type': 'translation',
             'copy_label': 'Translation',
         },
@@ -248,7 +245,7 @@ def create_output_panels(state: AppState, bridge=None):
                         False  # alignToTop=False -> scroll to bottom
                     )
 
-                chars, words = cfg['count_fn']()
+                chars, words = state.get_text_count(cfg['state_attr'])
                 count_labels[key].text = f'{chars} chars, {words} words'
 
                 # Update AI panel title dynamically
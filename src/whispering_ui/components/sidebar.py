@@ -4,13 +4,99 @@ Complete Sidebar Component with Help and File Upload
 Control panel with all settings and controls
 """
 
-from nicegui import ui, app
+import asyncio
+import functools
+import os
+import re
+import shutil
+from types import MappingProxyType
+from nicegui import ui, app, run, background_tasks
+from nicegui import core as nicegui_core
 import core
-from whispering_ui.state import AppState
+from whispering_ui.state import AppState, get_ai_config
 from whispering_ui.bridge import ProcessingBridge
 from whispering_ui.components.help import show_help_dialog
 from pathlib import Path
 
+# Permanent storage for uploaded reference voices, and the chunk size
+# used when streaming an upload there
+_TTS_VOICE_DIR = Path("tts_voices")
+_COPY_CHUNK_SIZE = 1 << 16  # 64 KiB
+
+# AI processing interval choices (label -> seconds)
+_INTERVAL_LABELS = ("5s", "10s", "15s", "20s", "25s", "30s", "45s", "1m", "1.5m", "2m")
+_INTERVAL_VALUES = (5, 10, 15, 20, 25, 30, 45, 60, 90, 120)
+_INTERVAL_MAP = MappingProxyType(dict(zip(_INTERVAL_LABELS, _INTERVAL_VALUES)))
+_INTERVAL_LABEL_FOR = MappingProxyType(dict(zip(_INTERVAL_VALUES, _INTERVAL_LABELS)))
+
+# Shared class/prop strings for the recurring widget styles
+_ROW_CLS = 'items-center w-full gap-1'
+_HEADER_ROW_CLS = 'items-center justify-between w-full'
+_HEADER_LBL_CLS = 'font-bold text-sm'
+_LBL_SM = 'text-xs w-12'
+_LBL_XS = 'text-xs'
+_BTN_ICON_PROPS = 'flat dense round size=sm'
+
+# Widget types toggled together when an AI/TTS section is enabled/disabled
+_SECTION_CONTROL_TYPES = (ui.select, ui.checkbox, ui.number, ui.radio, ui.upload, ui.button)
+
+# File range time input: M:SS or H:MM:SS
+_TIME_RE = re.compile(r'^(?:(\d+):)?(\d+):(\d+)$')
+
+# Native pywebview window (cached after the first successful lookup)
+# and the width last applied to it
+_MAIN_WINDOW = [None, None]
+
+# Fixed select choices, built once from the core constants
+_SOURCE_OPTIONS = ("auto", *core.sources)
+_TARGET_OPTIONS = ("none", *core.targets)
+_AUTOTYPE_OPTIONS = ("Off", "Whisper", "Translation", "AI")
+_TRIGGER_OPTIONS = ("Time", "Words")
+_TTS_FORMAT_OPTIONS = ("wav", "ogg")
+
+
+def _on_ui_loop(callback):
+    """Wrap a state listener so it runs on the NiceGUI event loop.
+
+    State fields such as file_playback_active are written from worker
+    threads; UI updates must be scheduled back onto the loop.
+    """
+    def dispatch():
+        loop = nicegui_core.loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is None or running is loop:
+            callback()
+        else:
+            loop.call_soon_threadsafe(callback)
+    return dispatch
+
+
+@functools.lru_cache(maxsize=1)
+def _mic_display(mic_list: tuple) -> tuple:
+    """Return mic select labels for a (hashable) snapshot of state.mic_list."""
+    return ("(system default)", *(name for idx, name in mic_list))
+
+
+def _setter(state: AppState, attr: str):
+    """Return a value-change handler that stores e.value on state.attr."""
+    return lambda e: setattr(state, attr, e.value)
+
+
+def _int_setter(state: AppState, attr: str, default: int):
+    """Like _setter, coercing the value to int (default when empty)."""
+    return lambda e: setattr(state, attr, int(e.value or default))
+
+
+def _index_map(options) -> dict:
+    """Map each option to the index of its first occurrence."""
+    index_map = {}
+    for i, option in enumerate(options):
+        index_map.setdefault(option, i)
+    return index_map
+
 
 def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=None):
     """
@@ -25,49 +111,85 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
     # Container for all controls - compact spacing
     sidebar_container = ui.column().classes('w-full h-full p-3 gap-1').style('overflow-y: auto;')
 
+    # Periodic updaters share a single timer. Each entry is
+    # [update_fn, snapshot_fn, last_snapshot]; the updater only runs when its
+    # snapshot changes (a snapshot_fn of None means run on every tick).
+    periodic_updates = []
+
+    def add_periodic_update(update_fn, snapshot_fn=None):
+        periodic_updates.append([update_fn, snapshot_fn, None])
+
+    def run_periodic_updates():
+        for entry in periodic_updates:
+            update_fn, snapshot_fn, last_snapshot = entry
+            if snapshot_fn is not None:
+                snapshot = snapshot_fn()
+                if snapshot == last_snapshot:
+                    continue
+                entry[2] = snapshot
+            update_fn()
+
     with sidebar_container:
         # === MICROPHONE SECTION ===
-        with ui.row().classes('items-center w-full gap-1'):
+        with ui.row().classes(_ROW_CLS):
             ui.label('Mic:').classes('text-xs w-10')
-            mic_display = ["(system default)"] + [name for idx, name in state.mic_list]
+            mic_display = list(_mic_display(tuple(state.mic_list)))
+            mic_index_map = _index_map(mic_display)
             mic_select = ui.select(
                 options=mic_display,
                 value=mic_display[0] if mic_display else None
             ).classes('flex-grow').props('dense')
-            mic_select.on_value_change(lambda e: setattr(state, 'mic_index',
-                                       mic_select.options.index(e.value) if e.value in mic_select.options else 0))
-
-            def refresh_mics():
-                bridge.refresh_mics()
-                mic_select.options = ["(system default)"] + [name for idx, name in state.mic_list]
+            mic_select.on_value_change(lambda e: setattr(state, 'mic_index', mic_index_map.get(e.value, 0)))
+
+            def apply_mic_list():
+                new_display = _mic_display(tuple(state.mic_list))
+                if new_display == tuple(mic_select.options):
+                    return  # Same devices - skip the options re-render
+                mic_select.options = list(new_display)
+                mic_index_map.clear()
+                mic_index_map.update(_index_map(new_display))
                 mic_select.update()
 
-            ui.button(icon='refresh', on_click=refresh_mics).props('flat dense round size=sm')
+            # The device list arrives after startup and on every refresh
+            state.subscribe('mic_list', _on_ui_loop(apply_mic_list))
+
+            async def refresh_mics():
+                # Device enumeration can block for a while; keep it off the loop
+                previous = tuple(state.mic_list)
+                refresh_btn.props('loading')
+                try:
+                    await run.io_bound(bridge.refresh_mics)
+                finally:
+                    refresh_btn.props(remove='loading')
+                if tuple(state.mic_list) == previous:
+                    ui.notify('No microphone changes')
+
+            refresh_btn = ui.button(icon='refresh', on_click=refresh_mics).props(_BTN_ICON_PROPS)
 
         # === CONTROL SECTION ===
         control_btn = ui.button(
             'Start',
             on_click=lambda: _toggle_recording(state, bridge, control_btn, level_progress, status_label)
-        ).classes('w-full').props('color=primary')
+        ).classes('w-full control-btn').props('color=primary')
 
         # Audio level - compact
-        with ui.row().classes('items-center w-full gap-1'):
-            ui.label('Level:').classes('text-xs w-12')
+        with ui.row().classes(_ROW_CLS):
+            ui.label('Level:').classes(_LBL_SM)
             level_progress = ui.linear_progress(value=0, show_value=False).classes('flex-grow')
 
         # Auto-stop - compact
-        with ui.row().classes('items-center w-full gap-1'):
+        with ui.row().classes(_ROW_CLS):
             autostop_cb = ui.checkbox('Auto-stop', value=state.auto_stop_enabled).props('dense')
-            autostop_cb.on_value_change(lambda e: setattr(state, 'auto_stop_enabled', e.value))
+            autostop_cb.on_value_change(_setter(state, 'auto_stop_enabled'))
 
-            autostop_num = ui.number(value=state.auto_stop_minutes, min=1, max=60, step=1).classes('w-14').props('dense')
-            autostop_num.on_value_change(lambda e: setattr(state, 'auto_stop_minutes', int(e.value or 5)))
+            autostop_num = ui.number(value=state.auto_stop_minutes, min=1, max=60, step=1).classes('w-14').props('dense debounce=150')
+            autostop_num.on_value_change(_int_setter(state, 'auto_stop_minutes', 5))
 
-            ui.label('min').classes('text-xs')
+            ui.label('min').classes(_LBL_XS)
 
             # Log to file checkbox
             log_cb = ui.checkbox('Save logs', value=state.log_enabled).props('dense')
-            log_cb.on_value_change(lambda e: setattr(state, 'log_enabled', e.value))
+            log_cb.on_value_change(_setter(state, 'log_enabled'))
 
         # Status - compact
         status_label = ui.label('').classes('text-xs text-red-400 mt-1')
@@ -75,9 +197,9 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
         ui.separator().classes('my-1')
 
         # === FILE TRANSCRIPTION SECTION ===
-        with ui.row().classes('items-center justify-between w-full'):
-            ui.label('File Transcription').classes('font-bold text-sm')
-            ui.button(icon='help_outline', on_click=lambda: show_help_dialog('file_transcription')).props('flat dense round size=sm')
+        with ui.row().classes(_HEADER_ROW_CLS):
+            ui.label('File Transcription').classes(_HEADER_LBL_CLS)
+            ui.button(icon='help_outline', on_click=lambda: show_help_dialog('file_transcription')).props(_BTN_ICON_PROPS)
 
         # Recovery notification (shown if recovery data exists)
         recovery_row = ui.row().classes('items-center w-full gap-1 bg-yellow-900 p-1 rounded')
@@ -89,45 +211,57 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
             ui.button('Resume', on_click=lambda: _apply_recovery(state, bridge, recovery_row, update_file_list_display)).props('dense size=sm color=warning')
             ui.button('Discard', on_click=lambda: _discard_recovery(state, bridge, recovery_row)).props('dense size=sm flat')
 
-        # Check for recovery on load
-        def check_recovery():
-            if bridge.check_recovery_available():
-                recovery_state = bridge.load_recovery_state()
-                if recovery_state:
-                    pos = recovery_state.get('position', 0)
-                    recovery_label.text = f"Resume from {_format_time(pos)}"
-                    recovery_row.set_visibility(True)
+        # Check for recovery on load (disk access runs off the event loop)
+        async def check_recovery():
+            if not await run.io_bound(bridge.check_recovery_available):
+                return
+            recovery_state = await run.io_bound(bridge.load_recovery_state)
+            if recovery_state:
+                pos = recovery_state.get('position', 0)
+                recovery_label.text = f"Resume from {_format_time(pos)}"
+                recovery_row.set_visibility(True)
 
         ui.timer(0.5, check_recovery, once=True)
 
         # File selection controls
         file_list_label = ui.label('No files selected').classes('text-xs text-gray-400 truncate w-full')
 
+        # Count shown by the last update (the single-file label depends on the name too)
+        last_rendered_count = [-1]
+
         def update_file_list_display():
             """Update the file list display."""
             count = len(state.file_transcription_paths)
+            if count == last_rendered_count[0] and count != 1:
+                return
+            last_rendered_count[0] = count
             if count == 0:
                 file_list_label.text = 'No files selected'
                 duration_label.text = ''
             elif count == 1:
-                import os
-                file_list_label.text = os.path.basename(state.file_transcription_paths[0])
-                # Get and display duration
-                try:
-                    dur = bridge.get_file_duration(state.file_transcription_paths[0])
-                    duration_label.text = f'Duration: {_format_time(dur)}'
-                except Exception:
-                    duration_label.text = ''
+                file_path = state.file_transcription_paths[0]
+                file_list_label.text = Path(file_path).name
+                # Duration is probed in the background and filled in when ready
+                duration_label.text = ''
+                background_tasks.create(load_duration(file_path))
             else:
                 file_list_label.text = f'{count} files selected'
                 duration_label.text = ''
 
+        async def load_duration(file_path):
+            """Probe the file duration off the event loop and display it."""
+            try:
+                dur = await run.io_bound(bridge.get_file_duration, file_path)
+            except Exception:
+                return
+            # Ignore the result if the selection changed while probing
+            if state.file_transcription_paths == [file_path]:
+                duration_label.text = f'Duration: {_format_time(dur)}'
+
         # File selection using system native dialog (Qt)
         async def on_add_files_click():
             """Handle file selection using Qt native dialog - no copying."""
             try:
-                from nicegui import run
-
                 def pick_files_qt():
                     """Run Qt file dialog in separate thread."""
                     from PyQt6.QtWidgets import QApplication, QFileDialog
@@ -147,47 +281,52 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
                 result = await run.io_bound(pick_files_qt)
 
                 if result:
-                    added = 0
+                    # Collect the whole selection first, then publish it in one assignment
+                    known = set(state.file_transcription_paths)
+                    new_paths = []
                     for file_path in result:
-                        if core.is_audio_file(file_path):
-                            if file_path not in state.file_transcription_paths:
-                                state.file_transcription_paths.append(file_path)
-                                added += 1
+                        if file_path not in known and core.is_audio_file(file_path):
+                            known.add(file_path)
+                            new_paths.append(file_path)
+                    added = len(new_paths)
+                    if added:
+                        state.file_transcription_paths = state.file_transcription_paths + new_paths
                     update_file_list_display()
                     if added > 0:
                         ui.notify(f"Added {added} file(s)", type='positive')
             except Exception as ex:
                 ui.notify(f"Error: {ex}", type='negative')
 
-        with ui.row().classes('items-center w-full gap-1'):
+        with ui.row().classes(_ROW_CLS):
             ui.button('Add Files', on_click=on_add_files_click).classes('flex-grow').props('dense')
-            ui.button(icon='clear', on_click=lambda: _clear_file_list(state, bridge, file_list_label, update_file_list_display)).props('flat dense round size=sm')
+            ui.button(icon='clear', on_click=lambda: _clear_file_list(state, bridge, file_list_label, update_file_list_display)).props(_BTN_ICON_PROPS)
 
         # Duration display
         duration_label = ui.label('').classes('text-xs text-gray-400')
 
         # Time range controls
-        with ui.row().classes('items-center w-full gap-1'):
-            ui.label('Range:').classes('text-xs w-12')
+        with ui.row().classes(_ROW_CLS):
+            ui.label('Range:').classes(_LBL_SM)
 
-            # Start time input
+            # Start time input (debounced client-side so typing "1:23:45"
+            # sends one value instead of one per keystroke)
             start_input = ui.input(
                 value='0:00',
                 on_change=lambda e: _parse_time_input(e.value, state, 'start')
-            ).classes('w-16').props('dense')
+            ).classes('w-16').props('dense debounce=300')
             start_input.tooltip('Start time (M:SS or H:MM:SS)')
 
-            ui.label('→').classes('text-xs')
+            ui.label('→').classes(_LBL_XS)
 
             # End time input
             end_input = ui.input(
                 value='end',
                 on_change=lambda e: _parse_time_input(e.value, state, 'end')
-            ).classes('w-16').props('dense')
+            ).classes('w-16').props('dense debounce=300')
             end_input.tooltip('End time (M:SS, H:MM:SS, or "end")')
 
             # Play/Pause button for scrubbing
-            play_btn = ui.button(icon='play_arrow', on_click=lambda: _toggle_audio_preview(state, bridge, play_btn, start_input)).props('flat dense round size=sm')
+            play_btn = ui.button(icon='play_arrow', on_click=lambda: _toggle_audio_preview(state, bridge, play_btn, start_input)).props(_BTN_ICON_PROPS)
             play_btn.tooltip('Play/Pause preview')
 
         # Progress bar for file transcription
@@ -200,8 +339,12 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
         # Save indicator - "Saved at: HH:MM:SS ...last words"
         save_indicator = ui.label('').classes('text-xs text-green-400 truncate w-full')
 
+        def set_save_indicator(text):
+            if save_indicator.text != text:
+                save_indicator.text = text
+
         # Start/Stop file transcription buttons
-        with ui.row().classes('items-center w-full gap-1'):
+        with ui.row().classes(_ROW_CLS):
             file_start_btn = ui.button(
                 'Transcribe',
                 on_click=lambda: _start_file_transcription(state, bridge, file_start_btn, file_stop_btn, file_progress)
@@ -213,9 +356,6 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
             ).classes('w-16').props('dense color=negative')
             file_stop_btn.set_enabled(False)
 
-        # Track last known playback state to detect changes
-        last_playback_state = [False]
-
         # Update file transcription UI periodically
         def update_file_ui():
             if state.file_transcription_active:
@@ -227,9 +367,9 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
 
                 # Update save indicator
                 if state.file_last_saved_time:
-                    save_indicator.text = f"Saved {state.file_last_saved_time}: {state.file_last_saved_text}"
+                    set_save_indicator(f"Saved {state.file_last_saved_time}: {state.file_last_saved_text}")
                 else:
-                    save_indicator.text = ""
+                    set_save_indicator("")
             else:
                 file_progress.set_visibility(state.file_transcription_progress > 0 and state.file_transcription_progress < 100)
                 file_current_label.text = ""
@@ -238,24 +378,34 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
 
                 # Keep save indicator visible after completion
                 if state.file_last_saved_time and state.file_transcription_progress == 100:
-                    save_indicator.text = f"Saved {state.file_last_saved_time}: {state.file_last_saved_text}"
-
-            # Update play button icon and state
+                    set_save_indicator(f"Saved {state.file_last_saved_time}: {state.file_last_saved_text}")
+
+        def file_ui_snapshot():
+            return (
+                state.file_transcription_active,
+                round(state.file_transcription_progress, 2),
+                state.file_transcription_current_file,
+                state.file_last_saved_time,
+                state.file_last_saved_text,
+                len(state.file_transcription_paths),
+            )
+
+        add_periodic_update(update_file_ui, file_ui_snapshot)
+
+        # Play button follows playback/file-list changes instead of polling
+        def update_play_btn():
             play_btn.set_enabled(len(state.file_transcription_paths) > 0)
-            if state.file_playback_active:
-                play_btn._props['icon'] = 'pause'
-                play_btn.update()
-            else:
-                play_btn._props['icon'] = 'play_arrow'
-                play_btn.update()
+            play_btn.props(f"icon={'pause' if state.file_playback_active else 'play_arrow'}")
 
-            # Update start time input when playback stops
-            if last_playback_state[0] and not state.file_playback_active:
+        def on_playback_changed():
+            update_play_btn()
+            if not state.file_playback_active:
                 # Playback just stopped - update start time input
                 start_input.value = _format_time(state.file_start_time)
-            last_playback_state[0] = state.file_playback_active
 
-        ui.timer(0.2, update_file_ui)
+        update_play_btn()
+        state.subscribe('file_transcription_paths', _on_ui_loop(update_play_btn))
+        state.subscribe('file_playback_active', _on_ui_loop(on_playback_changed))
 
         ui.separator().classes('my-1')
 
@@ -268,63 +418,63 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
         ui.separator().classes('my-1')
 
         # === MODEL SECTION ===
-        with ui.row().classes('items-center justify-between w-full'):
-            ui.label('Model Settings STT').classes('font-bold text-sm')
-            ui.button(icon='help_outline', on_click=lambda: show_help_dialog('model')).props('flat dense round size=sm')
+        with ui.row().classes(_HEADER_ROW_CLS):
+            ui.label('Model Settings STT').classes(_HEADER_LBL_CLS)
+            ui.button(icon='help_outline', on_click=lambda: show_help_dialog('model')).props(_BTN_ICON_PROPS)
 
-        with ui.row().classes('items-center w-full gap-1'):
-            ui.label('Model:').classes('text-xs w-12')
-            model_select = ui.select(options=core.models, value=state.model).classes('flex-grow').props('dense')
-            model_select.on_value_change(lambda e: setattr(state, 'model', e.value))
+        with ui.row().classes(_ROW_CLS):
+            ui.label('Model:').classes(_LBL_SM)
+            model_select = ui.select(options=list(core.models), value=state.model).classes('flex-grow').props('dense')
+            model_select.on_value_change(_setter(state, 'model'))
 
         # Options row - compact
         with ui.row().classes('items-center w-full gap-2'):
             vad_cb = ui.checkbox('VAD', value=state.vad_enabled).props('dense')
-            vad_cb.on_value_change(lambda e: setattr(state, 'vad_enabled', e.value))
+            vad_cb.on_value_change(_setter(state, 'vad_enabled'))
 
             para_cb = ui.checkbox('¶', value=state.para_detect_enabled).props('dense')
-            para_cb.on_value_change(lambda e: setattr(state, 'para_detect_enabled', e.value))
+            para_cb.on_value_change(_setter(state, 'para_detect_enabled'))
 
-            ui.label('Dev:').classes('text-xs')
-            dev_select = ui.select(options=core.devices, value=state.device).classes('w-16').props('dense')
-            dev_select.on_value_change(lambda e: setattr(state, 'device', e.value))
+            ui.label('Dev:').classes(_LBL_XS)
+            dev_select = ui.select(options=list(core.devices), value=state.device).classes('w-16').props('dense')
+            dev_select.on_value_change(_setter(state, 'device'))
 
         # Autotype
-        with ui.row().classes('items-center w-full gap-1'):
+        with ui.row().classes(_ROW_CLS):
             ui.label('⌨:').classes('text-xs w-8')
             auto_select = ui.select(
-                options=["Off", "Whisper", "Translation", "AI"],
+                options=list(_AUTOTYPE_OPTIONS),
                 value=state.autotype_mode
             ).classes('flex-grow').props('dense')
-            auto_select.on_value_change(lambda e: setattr(state, 'autotype_mode', e.value))
+            auto_select.on_value_change(_setter(state, 'autotype_mode'))
 
         # Voice commands
-        with ui.row().classes('items-center w-full gap-1'):
+        with ui.row().classes(_ROW_CLS):
             vcmd_cb = ui.checkbox('Voice Commands', value=state.voice_commands_enabled).props('dense')
-            vcmd_cb.on_value_change(lambda e: setattr(state, 'voice_commands_enabled', e.value))
+            vcmd_cb.on_value_change(_setter(state, 'voice_commands_enabled'))
             vcmd_cb.tooltip('Detect voice commands (comma, period, new paragraph, etc.)')
 
         ui.separator().classes('my-1')
 
         # === TRANSLATION SECTION ===
-        with ui.row().classes('items-center justify-between w-full'):
-            ui.label('Translation').classes('font-bold text-sm')
-            ui.button(icon='help_outline', on_click=lambda: show_help_dialog('translate')).props('flat dense round size=sm')
+        with ui.row().classes(_HEADER_ROW_CLS):
+            ui.label('Translation').classes(_HEADER_LBL_CLS)
+            ui.button(icon='help_outline', on_click=lambda: show_help_dialog('translate')).props(_BTN_ICON_PROPS)
 
-        with ui.row().classes('items-center w-full gap-1'):
+        with ui.row().classes(_ROW_CLS):
             ui.label('Source:').classes('text-xs w-14')
             src_select = ui.select(
-                options=["auto"] + core.sources,
+                options=list(_SOURCE_OPTIONS),
                 value=state.source_language
             ).classes('w-20').props('dense')
-            src_select.on_value_change(lambda e: setattr(state, 'source_language', e.value))
+            src_select.on_value_change(_setter(state, 'source_language'))
 
             ui.label('Target:').classes('text-xs w-14')
             tgt_select = ui.select(
-                options=["none"] + core.targets,
+                options=list(_TARGET_OPTIONS),
                 value=state.target_language
             ).classes('w-20').props('dense')
-            tgt_select.on_value_change(lambda e: setattr(state, 'target_language', e.value))
+            tgt_select.on_value_change(_setter(state, 'target_language'))
 
         # Translation provider hint
         translation_hint = ui.label('').classes('text-xs text-gray-400 italic')
@@ -341,7 +491,9 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
                 translation_hint.text = ""
 
         # Update hint when relevant values change
-        ui.timer(0.2, update_translation_hint)
+        update_translation_hint()
+        state.subscribe(('target_language', 'ai_enabled', 'ai_translate', 'ai_translate_only'),
+                        update_translation_hint)
 
         ui.separator().classes('my-1')
 
@@ -349,8 +501,12 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
         # Create a dialog positioned on the left side that acts as a drawer
         ai_tts_drawer = ui.dialog().props('position=left full-height seamless')
         ai_tts_drawer_visible = [False]
+        ai_tts_drawer_built = [False]
 
         def toggle_ai_tts_drawer():
+            if not ai_tts_drawer_built[0]:
+                build_ai_tts_drawer()
+                ai_tts_drawer_built[0] = True
             ai_tts_drawer_visible[0] = not ai_tts_drawer_visible[0]
             if ai_tts_drawer_visible[0]:
                 ai_tts_drawer.open()
@@ -367,7 +523,7 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
         ai_tts_drawer.on('hide', on_drawer_hide)
 
         # Row with button and status indicators
-        with ui.row().classes('items-center w-full gap-1'):
+        with ui.row().classes(_ROW_CLS):
             ai_tts_toggle_btn = ui.button(
                 'AI & TTS ▶',
                 on_click=toggle_ai_tts_drawer
@@ -377,136 +533,130 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
             ai_indicator = ui.label('AI').classes('text-xs px-1 rounded')
             tts_indicator = ui.label('TTS').classes('text-xs px-1 rounded')
 
-            def update_indicators():
-                """Update AI/TTS status indicators."""
-                if state.ai_enabled and state.ai_available:
-                    ai_indicator.classes(remove='bg-gray-600 text-gray-400')
-                    ai_indicator.classes(add='bg-green-700 text-white')
-                else:
-                    ai_indicator.classes(remove='bg-green-700 text-white')
-                    ai_indicator.classes(add='bg-gray-600 text-gray-400')
+            # Last applied on/off state per indicator, to skip redundant class writes
+            last_indicator_state = {'ai': None, 'tts': None}
 
-                if state.tts_enabled and state.tts_available:
-                    tts_indicator.classes(remove='bg-gray-600 text-gray-400')
-                    tts_indicator.classes(add='bg-green-700 text-white')
+            def set_indicator(key, indicator, active):
+                if last_indicator_state[key] == active:
+                    return
+                last_indicator_state[key] = active
+                if active:
+                    indicator.classes(add='bg-green-700 text-white', remove='bg-gray-600 text-gray-400')
                 else:
-                    tts_indicator.classes(remove='bg-green-700 text-white')
-                    tts_indicator.classes(add='bg-gray-600 text-gray-400')
+                    indicator.classes(add='bg-gray-600 text-gray-400', remove='bg-green-700 text-white')
 
-            # Initial state
-            update_indicators()
+            def update_indicators():
+                """Update AI/TTS status indicators."""
+                set_indicator('ai', ai_indicator, bool(state.ai_enabled and state.ai_available))
+                set_indicator('tts', tts_indicator, bool(state.tts_enabled and state.tts_available))
 
-            # Periodic update for indicator state
-            ui.timer(0.3, update_indicators)
-
-        # Drawer content
-        with ai_tts_drawer, ui.card().classes('h-full w-80 p-3 gap-1').style('overflow-y: auto;'):
-            # Close button at top
-            with ui.row().classes('items-center justify-between w-full mb-2'):
-                ui.label('AI & TTS Settings').classes('font-bold text-sm')
-                ui.button(icon='close', on_click=lambda: (ai_tts_drawer.close(), setattr(ai_tts_toggle_btn, 'text', 'AI & TTS ▶'))).props('flat dense round size=sm')
-            # === AI SECTION ===
-            with ui.row().classes('items-center justify-between w-full'):
-                ui.label('AI Processing').classes('font-bold text-sm')
+            # Initial state, then refresh whenever a relevant flag changes
+            update_indicators()
+            state.subscribe(('ai_enabled', 'ai_available', 'tts_enabled', 'tts_available'),
+                            update_indicators)
+
+        # Drawer content - built on first open so the AI config load and
+        # the AI/TTS widgets stay off the startup path
+        def build_ai_tts_drawer():
+            with ai_tts_drawer, ui.card().classes('h-full w-80 p-3 gap-1').style('overflow-y: auto;'):
+                # Close button at top
+                with ui.row().classes('items-center justify-between w-full mb-2'):
+                    ui.label('AI & TTS Settings').classes(_HEADER_LBL_CLS)
+                    ui.button(icon='close', on_click=lambda: (ai_tts_drawer.close(), setattr(ai_tts_toggle_btn, 'text', 'AI & TTS ▶'))).props(_BTN_ICON_PROPS)
+                # === AI SECTION ===
+                with ui.row().classes(_HEADER_ROW_CLS):
+                    ui.label('AI Processing').classes(_HEADER_LBL_CLS)
+                    if state.ai_available:
+                        ui.button(icon='help_outline', on_click=lambda: show_help_dialog('ai')).props(_BTN_ICON_PROPS)
+
+                # Enable AI checkbox
+                ai_cb = ui.checkbox('Enable AI', value=state.ai_enabled).props('dense')
+                ai_section = ui.column().classes('w-full gap-1')
+                ai_process_btn = None
+                ai_trigger_select = None
+                ai_interval_select = None
+                ai_words_num = None
+
+                # AI controls
                 if state.ai_available:
-                    ui.button(icon='help_outline', on_click=lambda: show_help_dialog('ai')).props('flat dense round size=sm')
-
-            # Enable AI checkbox
-            ai_cb = ui.checkbox('Enable AI', value=state.ai_enabled).props('dense')
-            ai_section = ui.column().classes('w-full gap-1')
-            ai_controls = []
-            ai_process_btn = None
-            ai_trigger_select = None
-            ai_interval_select = None
-            ai_words_num = None
-
-            def register_ai(control):
-                ai_controls.append(control)
-                return control
-
-            # AI controls
-            if state.ai_available:
-                with ai_section:
-                    try:
-                        from ai_config import load_ai_config
-                        ai_config = load_ai_config()
-                        if ai_config:
+                    with ai_section:
+                        # Persona/model names are cached on the state after the first load
+                        if not state.ai_persona_names:
+                            ai_config = get_ai_config()
+                            if ai_config:
+                                try:
+                                    state.ai_persona_names = [p['name'] for p in ai_config.get_personas()]
+                                    state.ai_model_names = [m['name'] for m in ai_config.get_models()]
+                                except (KeyError, TypeError) as e:
+                                    print(f"Error loading AI config: {e}")
+                        persona_names = state.ai_persona_names
+                        model_names = state.ai_model_names
+                        persona_index_map = _index_map(persona_names)
+                        model_index_map = _index_map(model_names)
+                        if persona_names and model_names:
                             # Task selection
-                            personas = ai_config.get_personas()
-                            persona_names = [p['name'] for p in personas]
 
-                            with ui.row().classes('items-center w-full gap-1'):
-                                ui.label('Task:').classes('text-xs w-12')
-                                task_select = register_ai(ui.select(
+                            with ui.row().classes(_ROW_CLS):
+                                ui.label('Task:').classes(_LBL_SM)
+                                task_select = ui.select(
                                     options=persona_names,
                                     value=persona_names[min(state.ai_persona_index, len(persona_names)-1)]
-                                ).classes('flex-grow').props('dense'))
+                                ).classes('flex-grow').props('dense')
                                 task_select.on_value_change(lambda e: setattr(state, 'ai_persona_index',
-                                                            persona_names.index(e.value) if e.value in persona_names else 0))
+                                                            persona_index_map.get(e.value, 0)))
 
                             # Translate checkboxes - compact
                             with ui.row().classes('items-center w-full gap-2'):
-                                ai_trans_cb = register_ai(ui.checkbox('Translate', value=state.ai_translate).props('dense'))
-                                ai_trans_cb.on_value_change(lambda e: setattr(state, 'ai_translate', e.value))
+                                ai_trans_cb = ui.checkbox('Translate', value=state.ai_translate).props('dense')
+                                ai_trans_cb.on_value_change(_setter(state, 'ai_translate'))
 
-                                ai_trans_only_cb = register_ai(ui.checkbox('Only (1:1)', value=state.ai_translate_only).props('dense'))
-                                ai_trans_only_cb.on_value_change(lambda e: setattr(state, 'ai_translate_only', e.value))
+                                ai_trans_only_cb = ui.checkbox('Only (1:1)', value=state.ai_translate_only).props('dense')
+                                ai_trans_only_cb.on_value_change(_setter(state, 'ai_translate_only'))
 
                             # Model selection
-                            models = ai_config.get_models()
-                            model_names = [m['name'] for m in models]
-
-                            with ui.row().classes('items-center w-full gap-1'):
-                                ui.label('Model:').classes('text-xs w-12')
-                                ai_model_combo = register_ai(ui.select(
+                            with ui.row().classes(_ROW_CLS):
+                                ui.label('Model:').classes(_LBL_SM)
+                                ai_model_combo = ui.select(
                                     options=model_names,
                                     value=model_names[min(state.ai_model_index, len(model_names)-1)]
-                                ).classes('flex-grow').props('dense'))
+                                ).classes('flex-grow').props('dense')
                                 ai_model_combo.on_value_change(lambda e: setattr(state, 'ai_model_index',
-                                                               model_names.index(e.value) if e.value in model_names else 0))
+                                                               model_index_map.get(e.value, 0)))
 
                             # Trigger controls - compact layout
-                            ai_manual_cb = register_ai(ui.checkbox('Manual mode', value=state.ai_manual_mode).props('dense'))
+                            ai_manual_cb = ui.checkbox('Manual mode', value=state.ai_manual_mode).props('dense')
 
-                            ai_process_btn = register_ai(ui.button('⚡ Process Now', on_click=lambda: bridge.manual_ai_trigger()).classes('w-full').props('dense'))
+                            ai_process_btn = ui.button('⚡ Process Now', on_click=lambda: bridge.manual_ai_trigger()).classes('w-full').props('dense')
                             ai_process_btn.set_enabled(state.ai_manual_mode)
 
                             # Trigger mode and settings
-                            with ui.row().classes('items-center w-full gap-1'):
-                                ui.label('Trigger:').classes('text-xs')
-                                ai_trigger_select = register_ai(ui.select(
-                                    options=["Time", "Words"],
+                            with ui.row().classes(_ROW_CLS):
+                                ui.label('Trigger:').classes(_LBL_XS)
+                                ai_trigger_select = ui.select(
+                                    options=list(_TRIGGER_OPTIONS),
                                     value=state.ai_trigger_mode.capitalize()
-                                ).classes('w-16').props('dense'))
+                                ).classes('w-16').props('dense')
                                 ai_trigger_select.set_enabled(not state.ai_manual_mode)
 
                                 # Interval control
-                                interval_labels = ["5s", "10s", "15s", "20s", "25s", "30s", "45s", "1m", "1.5m", "2m"]
-                                interval_values = [5, 10, 15, 20, 25, 30, 45, 60, 90, 120]
-                                interval_map = dict(zip(interval_labels, interval_values))
-
-                                current_label = "20s"
-                                for lbl, val in interval_map.items():
-                                    if val == state.ai_process_interval:
-                                        current_label = lbl
-                                        break
-
-                                ui.label('Int:').classes('text-xs')
-                                ai_interval_select = register_ai(ui.select(
-                                    options=interval_labels,
+                                current_label = _INTERVAL_LABEL_FOR.get(state.ai_process_interval, "20s")
+
+                                ui.label('Int:').classes(_LBL_XS)
+                                ai_interval_select = ui.select(
+                                    options=list(_INTERVAL_LABELS),
                                     value=current_label
-                                ).classes('w-14').props('dense'))
+                                ).classes('w-14').props('dense')
 
                                 def on_interval_change(e):
-                                    state.ai_process_interval = interval_map.get(e.value, 20)
+                                    state.ai_process_interval = _INTERVAL_MAP.get(e.value, 20)
 
                                 ai_interval_select.on_value_change(on_interval_change)
                                 ai_interval_select.set_enabled(not state.ai_manual_mode)
                                 ai_interval_select.set_visibility(state.ai_trigger_mode == "time")
 
-                                ui.label('W:').classes('text-xs')
-                                ai_words_num = register_ai(ui.number(value=state.ai_process_words, min=50, max=500, step=50).classes('w-16').props('dense'))
-                                ai_words_num.on_value_change(lambda e: setattr(state, 'ai_process_words', int(e.value or 150)))
+                                ui.label('W:').classes(_LBL_XS)
+                                ai_words_num = ui.number(value=state.ai_process_words, min=50, max=500, step=50).classes('w-16').props('dense debounce=150')
+                                ai_words_num.on_value_change(_int_setter(state, 'ai_process_words', 150))
                                 ai_words_num.set_enabled(not state.ai_manual_mode)
                                 ai_words_num.set_visibility(state.ai_trigger_mode == "words")
 
@@ -517,249 +667,251 @@ def create_sidebar(state: AppState, bridge: ProcessingBridge, output_container=N
                             ai_trigger_select.on_value_change(lambda e: _on_trigger_changed(
                                 state, e.value, ai_interval_select, ai_words_num))
 
-                    except Exception as e:
-                        print(f"Error loading AI config: {e}")
+                def on_ai_toggle(e):
+                    state.ai_enabled = e.value
+                    active = e.value and state.ai_available
+                    _set_section_visual_state(ai_section, active)
+                    _set_controls_enabled(ai_section, active)
+                    if active and state.ai_available and all(ctrl is not None for ctrl in (ai_process_btn, ai_trigger_select, ai_interval_select, ai_words_num)):
+                        _on_manual_mode_changed(state, state.ai_manual_mode, ai_process_btn, ai_trigger_select, ai_interval_select, ai_words_num)
+                        _on_trigger_changed(state, state.ai_trigger_mode.capitalize(), ai_interval_select, ai_words_num)
+
+                ai_cb.on_value_change(on_ai_toggle)
+                if not state.ai_available:
+                    ai_cb.disable()
 
-            def on_ai_toggle(e):
-                state.ai_enabled = e.value
-                active = e.value and state.ai_available
-                _set_section_visual_state(ai_section, active)
-                _set_controls_enabled(ai_controls, active)
-                if active and state.ai_available and all(ctrl is not None for ctrl in (ai_process_btn, ai_trigger_select, ai_interval_select, ai_words_num)):
-                    _on_manual_mode_changed(state, state.ai_manual_mode, ai_process_btn, ai_trigger_select, ai_interval_select, ai_words_num)
-                    _on_trigger_changed(state, state.ai_trigger_mode.capitalize(), ai_interval_select, ai_words_num)
+                _set_section_visual_state(ai_section, state.ai_enabled and state.ai_available)
+                _set_controls_enabled(ai_section, state.ai_enabled and state.ai_available)
 
-            ai_cb.on_value_change(on_ai_toggle)
-            if not state.ai_available:
-                ai_cb.disable()
+                ui.separator().classes('my-1')
 
-            _set_section_visual_state(ai_section, state.ai_enabled and state.ai_available)
-            _set_controls_enabled(ai_controls, state.ai_enabled and state.ai_available)
+                # === TTS SECTION ===
+                with ui.row().classes(_HEADER_ROW_CLS):
+                    ui.label('Text-to-Speech').classes(_HEADER_LBL_CLS)
+                    if state.tts_available:
+                        ui.button(icon='help_outline', on_click=lambda: show_help_dialog('tts')).props(_BTN_ICON_PROPS)
 
-            ui.separator().classes('my-1')
+                # Enable TTS
+                tts_cb = ui.checkbox('Enable TTS', value=state.tts_enabled).props('dense')
+                tts_section = ui.column().classes('w-full gap-1')
 
-            # === TTS SECTION ===
-            with ui.row().classes('items-center justify-between w-full'):
-                ui.label('Text-to-Speech').classes('font-bold text-sm')
                 if state.tts_available:
-                    ui.button(icon='help_outline', on_click=lambda: show_help_dialog('tts')).props('flat dense round size=sm')
-
-            # Enable TTS
-            tts_cb = ui.checkbox('Enable TTS', value=state.tts_enabled).props('dense')
-            tts_section = ui.column().classes('w-full gap-1')
-            tts_controls = []
-
-            def register_tts(control):
-                tts_controls.append(control)
-                return control
-
-            if state.tts_available:
-                has_any_backend = any(state.tts_backends_available.values())
-
-                with tts_section:
-                    # Backend selection
-                    with ui.row().classes('items-center w-full gap-1'):
-                        ui.label('Engine:').classes('text-xs w-10')
-                        # Build backend options with availability labels
-                        backend_options = {}
-                        for bname in ["chatterbox", "qwen3", "kokoro"]:
-                            installed = state.tts_backends_available.get(bname, False)
-                            if installed:
-                                backend_options[bname] = bname
-                            else:
-                                backend_options[bname] = f"{bname} (not installed)"
-
-                        tts_backend_select = register_tts(ui.select(
-                            options=backend_options,
-                            value=state.tts_backend
-                        ).classes('flex-grow').props('dense'))
-
-                        def on_backend_change(e):
-                            selected = e.value
-                            installed = state.tts_backends_available.get(selected, False)
-                            if not installed:
-                                state.tts_status_message = f"{selected} not installed. Run: ./scripts/install.sh --tts={selected}"
-                                state.tts_enabled = False
-                                tts_cb.value = False
-                            else:
-                                state.tts_backend = selected
+                    has_any_backend = any(state.tts_backends_available.values())
+
+                    with tts_section:
+                        # Backend selection
+                        with ui.row().classes(_ROW_CLS):
+                            ui.label('Engine:').classes('text-xs w-10')
+                            # Build backend options with availability labels
+                            backend_options = {}
+                            for bname in ["chatterbox", "qwen3", "kokoro"]:
+                                installed = state.tts_backends_available.get(bname, False)
+                                if installed:
+                                    backend_options[bname] = bname
+                                else:
+                                    backend_options[bname] = f"{bname} (not installed)"
+
+                            tts_backend_select = ui.select(
+                                options=backend_options,
+                                value=state.tts_backend
+                            ).classes('flex-grow').props('dense')
+
+                            def on_backend_change(e):
+                                selected = e.value
+                                installed = state.tts_backends_available.get(selected, False)
+                                if not installed:
+                                    state.tts_status_message = f"{selected} not installed. Run: ./scripts/install.sh --tts={selected}"
+                                    state.tts_enabled = False
+                                    tts_cb.value = False
+                                else:
+                                    state.tts_backend = selected
+                                    if bridge.tts_controller:
+                                        bridge.tts_controller.switch_backend(
+                                            backend=selected,
+                                            qwen3_model_size=state.tts_qwen3_model_size,
+                                            qwen3_speaker=state.tts_qwen3_speaker,
+                                            kokoro_voice=state.tts_kokoro_voice,
+                                        )
+                                    state.tts_status_message = ""
+                                # Show/hide backend-specific options
+                                qwen3_row.set_visibility(selected == "qwen3")
+                                kokoro_row.set_visibility(selected == "kokoro")
+
+                            tts_backend_select.on_value_change(on_backend_change)
+
+                        # Install hint when no backends available
+                        if not has_any_backend:
+                            ui.label('No TTS engine installed').classes('text-xs text-orange-400')
+                            ui.label('Run: ./scripts/install.sh --tts').classes('text-xs text-gray-500')
+
+                        # Qwen3-TTS specific options (speaker + model size)
+                        qwen3_row = ui.row().classes(_ROW_CLS)
+                        qwen3_row.set_visibility(state.tts_backend == "qwen3")
+
+                        with qwen3_row:
+                            ui.label('Speaker:').classes(_LBL_XS)
+                            from tts_provider import QWEN3_SPEAKERS, QWEN3_MODEL_SIZES
+                            qwen3_speaker_select = ui.select(
+                                options=QWEN3_SPEAKERS,
+                                value=state.tts_qwen3_speaker
+                            ).classes('flex-grow').props('dense')
+
+                            def on_speaker_change(e):
+                                state.tts_qwen3_speaker = e.value
                                 if bridge.tts_controller:
+                                    bridge.tts_controller.set_parameters(speaker=e.value)
+
+                            qwen3_speaker_select.on_value_change(on_speaker_change)
+
+                            ui.label('Size:').classes(_LBL_XS)
+                            qwen3_size_select = ui.select(
+                                options=QWEN3_MODEL_SIZES,
+                                value=state.tts_qwen3_model_size
+                            ).classes('w-14').props('dense')
+
+                            def on_size_change(e):
+                                state.tts_qwen3_model_size = e.value
+                                if bridge.tts_controller and state.tts_backend == "qwen3":
                                     bridge.tts_controller.switch_backend(
-                                        backend=selected,
-                                        qwen3_model_size=state.tts_qwen3_model_size,
+                                        backend="qwen3",
+                                        qwen3_model_size=e.value,
                                         qwen3_speaker=state.tts_qwen3_speaker,
-                                        kokoro_voice=state.tts_kokoro_voice,
                                     )
-                                state.tts_status_message = ""
-                            # Show/hide backend-specific options
-                            qwen3_row.set_visibility(selected == "qwen3")
-                            kokoro_row.set_visibility(selected == "kokoro")
-
-                        tts_backend_select.on_value_change(on_backend_change)
-
-                    # Install hint when no backends available
-                    if not has_any_backend:
-                        ui.label('No TTS engine installed').classes('text-xs text-orange-400')
-                        ui.label('Run: ./scripts/install.sh --tts').classes('text-xs text-gray-500')
-
-                    # Qwen3-TTS specific options (speaker + model size)
-                    qwen3_row = ui.row().classes('items-center w-full gap-1')
-                    qwen3_row.set_visibility(state.tts_backend == "qwen3")
-
-                    with qwen3_row:
-                        ui.label('Speaker:').classes('text-xs')
-                        from tts_provider import QWEN3_SPEAKERS, QWEN3_MODEL_SIZES
-                        qwen3_speaker_select = register_tts(ui.select(
-                            options=QWEN3_SPEAKERS,
-                            value=state.tts_qwen3_speaker
-                        ).classes('flex-grow').props('dense'))
-
-                        def on_speaker_change(e):
-                            state.tts_qwen3_speaker = e.value
-                            if bridge.tts_controller:
-                                bridge.tts_controller.set_parameters(speaker=e.value)
-
-                        qwen3_speaker_select.on_value_change(on_speaker_change)
-
-                        ui.label('Size:').classes('text-xs')
-                        qwen3_size_select = register_tts(ui.select(
-                            options=QWEN3_MODEL_SIZES,
-                            value=state.tts_qwen3_model_size
-                        ).classes('w-14').props('dense'))
-
-                        def on_size_change(e):
-                            state.tts_qwen3_model_size = e.value
-                            if bridge.tts_controller and state.tts_backend == "qwen3":
-                                bridge.tts_controller.switch_backend(
-                                    backend="qwen3",
-                                    qwen3_model_size=e.value,
-                                    qwen3_speaker=state.tts_qwen3_speaker,
-                                )
-
-                        qwen3_size_select.on_value_change(on_size_change)
-
-                    # Kokoro-specific options (voice selection)
-                    kokoro_row = ui.row().classes('items-center w-full gap-1')
-                    kokoro_row.set_visibility(state.tts_backend == "kokoro")
-
-                    with kokoro_row:
-                        ui.label('Voice:').classes('text-xs')
-                        from tts_provider import KOKORO_VOICES
-                        kokoro_voice_select = register_tts(ui.select(
-                            options=KOKORO_VOICES,
-                            value=state.tts_kokoro_voice
-                        ).classes('flex-grow').props('dense'))
-
-                        def on_kokoro_voice_change(e):
-                            state.tts_kokoro_voice = e.value
-                            if bridge.tts_controller:
-                                bridge.tts_controller.set_parameters(speaker=e.value)
-
-                        kokoro_voice_select.on_value_change(on_kokoro_voice_change)
-
-                    # Source selection - compact
-                    with ui.row().classes('items-center w-full gap-1'):
-                        ui.label('Src:').classes('text-xs w-10')
-
-                        tts_w_cb = register_tts(ui.checkbox('W', value=(state.tts_source == "whisper")).props('dense'))
-                        tts_a_cb = register_tts(ui.checkbox('A', value=(state.tts_source == "ai")).props('dense'))
-                        tts_t_cb = register_tts(ui.checkbox('T', value=(state.tts_source == "translation")).props('dense'))
-
-                        tts_w_cb.on_value_change(lambda e: _on_tts_source_changed(state, "whisper", e.value, tts_w_cb, tts_a_cb, tts_t_cb))
-                        tts_a_cb.on_value_change(lambda e: _on_tts_source_changed(state, "ai", e.value, tts_w_cb, tts_a_cb, tts_t_cb))
-                        tts_t_cb.on_value_change(lambda e: _on_tts_source_changed(state, "translation", e.value, tts_w_cb, tts_a_cb, tts_t_cb))
-
-                    # Voice selection with streamlined upload
-                    with ui.row().classes('items-center w-full gap-1'):
-                        ui.label('Voice:').classes('text-xs w-10')
-                        tts_voice_label = ui.label(state.tts_voice_display_name).classes('flex-grow text-xs text-gray-400 truncate')
-
-                        upload = register_tts(ui.upload(
-                            on_upload=lambda e: _on_voice_upload(e, state, bridge, tts_voice_label),
-                            auto_upload=True,
-                            max_file_size=50_000_000,
-                            max_files=1
-                        ).props('accept=audio/*').classes('hidden'))
-
-                        register_tts(ui.button(icon='folder_open', on_click=lambda u=upload: u.run_method('pickFiles')).props('flat dense round size=sm'))
-                        register_tts(ui.button(icon='clear', on_click=lambda: _clear_voice(state, bridge, tts_voice_label)).props('flat dense round size=sm'))
-
-                    # Output options - compact
-                    with ui.row().classes('items-center w-full gap-1'):
-                        ui.label('Out:').classes('text-xs w-10')
-
-                        tts_play_cb = register_tts(ui.checkbox('Play', value=state.tts_auto_play).props('dense'))
-                        tts_play_cb.on_value_change(lambda e: setattr(state, 'tts_auto_play', e.value))
-                        tts_play_cb.tooltip('Play audio through speakers in real time')
-
-                        tts_save_cb = register_tts(ui.checkbox('Save', value=state.tts_save_file).props('dense'))
-                        tts_save_cb.on_value_change(lambda e: setattr(state, 'tts_save_file', e.value))
-
-                        tts_format_select = register_tts(ui.select(options=["wav", "ogg"], value=state.tts_format).classes('w-16').props('dense'))
-                        tts_format_select.on_value_change(lambda e: setattr(state, 'tts_format', e.value))
-
-                    # TTS status - compact
-                    tts_status_label = ui.label('').classes('text-xs text-blue-400')
-
-                    def update_tts_status():
-                        msg = state.tts_status_message
-                        if msg:
-                            # Color errors orange/red
-                            if 'not installed' in msg or 'error' in msg.lower() or 'failed' in msg.lower():
-                                tts_status_label.classes(replace='text-xs text-orange-400')
-                            else:
-                                tts_status_label.classes(replace='text-xs text-blue-400')
-                            tts_status_label.text = msg[:60]
-                        else:
-                            tts_status_label.text = ''
-                        # Sync playback state from controller
-                        if bridge.tts_controller:
-                            state.tts_is_playing = bridge.tts_controller.is_playing
-
-                    ui.timer(0.2, update_tts_status)
-
-            def on_tts_toggle(e):
-                # Check if selected backend is actually installed
-                backend_installed = state.tts_backends_available.get(state.tts_backend, False)
-                if e.value and not backend_installed:
-                    state.tts_status_message = f"{state.tts_backend} not installed. Run: ./scripts/install.sh --tts"
-                    e.sender.value = False
-                    state.tts_enabled = False
-                    return
-                state.tts_enabled = e.value
-                active = e.value and state.tts_available
-                _set_section_visual_state(tts_section, active)
-                _set_controls_enabled(tts_controls, active)
 
-            tts_cb.on_value_change(on_tts_toggle)
-            if not state.tts_available:
-                tts_cb.disable()
+                            qwen3_size_select.on_value_change(on_size_change)
+
+                        # Kokoro-specific options (voice selection)
+                        kokoro_row = ui.row().classes(_ROW_CLS)
+                        kokoro_row.set_visibility(state.tts_backend == "kokoro")
+
+                        with kokoro_row:
+                            ui.label('Voice:').classes(_LBL_XS)
+                            from tts_provider import KOKORO_VOICES
+                            kokoro_voice_select = ui.select(
+                                options=KOKORO_VOICES,
+                                value=state.tts_kokoro_voice
+                            ).classes('flex-grow').props('dense')
 
-            _set_section_visual_state(tts_section, state.tts_enabled and state.tts_available)
-            _set_controls_enabled(tts_controls, state.tts_enabled and state.tts_available)
+                            def on_kokoro_voice_change(e):
+                                state.tts_kokoro_voice = e.value
+                                if bridge.tts_controller:
+                                    bridge.tts_controller.set_parameters(speaker=e.value)
+
+                            kokoro_voice_select.on_value_change(on_kokoro_voice_change)
+
+                        # Source selection - compact
+                        with ui.row().classes(_ROW_CLS):
+                            ui.label('Src:').classes('text-xs w-10')
+
+                            tts_src_radio = ui.radio(
+                                {'whisper': 'W', 'ai': 'A', 'translation': 'T'},
+                                value=state.tts_source
+                            ).props('dense inline')
+                            tts_src_radio.on_value_change(_setter(state, 'tts_source'))
+
+                        # Voice selection with streamlined upload
+                        with ui.row().classes(_ROW_CLS):
+                            ui.label('Voice:').classes('text-xs w-10')
+                            tts_voice_label = ui.label(state.tts_voice_display_name).classes('flex-grow text-xs text-gray-400 truncate')
+
+                            upload = ui.upload(
+                                on_upload=lambda e: _on_voice_upload(e, state, bridge, tts_voice_label),
+                                auto_upload=True,
+                                max_file_size=50_000_000,
+                                max_files=1
+                            ).props('accept=audio/*').classes('hidden')
+
+                            ui.button(icon='folder_open', on_click=lambda u=upload: u.run_method('pickFiles')).props(_BTN_ICON_PROPS)
+                            ui.button(icon='clear', on_click=lambda: _clear_voice(state, bridge, tts_voice_label)).props(_BTN_ICON_PROPS)
+
+                        # Output options - compact
+                        with ui.row().classes(_ROW_CLS):
+                            ui.label('Out:').classes('text-xs w-10')
+
+                            tts_play_cb = ui.checkbox('Play', value=state.tts_auto_play).props('dense')
+                            tts_play_cb.on_value_change(_setter(state, 'tts_auto_play'))
+                            tts_play_cb.tooltip('Play audio through speakers in real time')
+
+                            tts_save_cb = ui.checkbox('Save', value=state.tts_save_file).props('dense')
+                            tts_save_cb.on_value_change(_setter(state, 'tts_save_file'))
+
+                            tts_format_select = ui.select(options=list(_TTS_FORMAT_OPTIONS), value=state.tts_format).classes('w-16').props('dense')
+                            tts_format_select.on_value_change(_setter(state, 'tts_format'))
+
+                        # TTS status - compact
+                        tts_status_label = ui.label('').classes('text-xs text-blue-400')
+
+                        def update_tts_status():
+                            msg = state.tts_status_message
+                            if msg:
+                                # Color errors orange/red
+                                if 'not installed' in msg or 'error' in msg.lower() or 'failed' in msg.lower():
+                                    tts_status_label.classes(replace='text-xs text-orange-400')
+                                else:
+                                    tts_status_label.classes(replace='text-xs text-blue-400')
+                                tts_status_label.text = msg[:60]
+                            else:
+                                tts_status_label.text = ''
+
+                        update_tts_status()
+                        state.subscribe('tts_status_message', _on_ui_loop(update_tts_status))
+
+                def on_tts_toggle(e):
+                    # Check if selected backend is actually installed
+                    backend_installed = state.tts_backends_available.get(state.tts_backend, False)
+                    if e.value and not backend_installed:
+                        state.tts_status_message = f"{state.tts_backend} not installed. Run: ./scripts/install.sh --tts"
+                        e.sender.value = False
+                        state.tts_enabled = False
+                        return
+                    state.tts_enabled = e.value
+                    active = e.value and state.tts_available
+                    _set_section_visual_state(tts_section, active)
+                    _set_controls_enabled(tts_section, active)
+
+                tts_cb.on_value_change(on_tts_toggle)
+                if not state.tts_available:
+                    tts_cb.disable()
+
+                _set_section_visual_state(tts_section, state.tts_enabled and state.tts_available)
+                _set_controls_enabled(tts_section, state.tts_enabled and state.tts_available)
+
+        # Level meter is pushed whenever the bridge publishes a new level
+        # (audio_level is an int, so every notification is a >= 1 step)
+        def update_level():
+            level_progress.value = state.audio_level / 100.0
 
-        # Update UI periodically - faster for audio level
-        def update_ui():
-            # Update button
+        state.subscribe('audio_level', _on_ui_loop(update_level))
+
+        # Button and status line follow their state fields directly
+        def update_control_btn():
+            # Colour swap is a class toggle (see whispering.css)
             if state.is_recording:
                 control_btn.text = 'Stop'
-                control_btn.props('color=negative')
+                control_btn.classes(add='is-recording')
             else:
                 control_btn.text = 'Start'
-                control_btn.props('color=primary')
+                control_btn.classes(remove='is-recording')
 
-            # Update level - NO smoothing
-            level_progress.value = state.audio_level / 100.0
+        def update_status():
+            status_label.text = state.status_display
 
-            # Update status
-            if state.error_message:
-                status_label.text = f'Error: {state.error_message[:40]}'
-            elif state.status_message:
-                status_label.text = state.status_message[:40]
-            else:
-                status_label.text = ''
+        update_control_btn()
+        update_status()
+        state.subscribe('is_recording', _on_ui_loop(update_control_btn))
+        state.subscribe('status_display', _on_ui_loop(update_status))
+
+        # Sync playback state from the controller. Registered here rather than
+        # in the lazy drawer so it runs even if the drawer is never opened
+        # (nothing reads it while TTS is switched off).
+        def sync_tts_playback():
+            if state.tts_enabled and bridge.tts_controller:
+                state.tts_is_playing = bridge.tts_controller.is_playing
+
+        add_periodic_update(sync_tts_playback)
 
-        ui.timer(0.05, update_ui)
+        # Single dispatcher for all periodic updaters above
+        ui.timer(0.2, run_periodic_updates)
 
     return sidebar_container
 
@@ -783,64 +935,62 @@ def _toggle_recording(state: AppState, bridge: ProcessingBridge, btn, level, sta
 def _on_manual_mode_changed(state: AppState, manual_mode: bool, process_btn, trigger_select, interval_select, words_num):
     """Handle manual mode checkbox change."""
     state.ai_manual_mode = manual_mode
+    auto_mode = not manual_mode
     process_btn.set_enabled(manual_mode)
-    trigger_select.set_enabled(not manual_mode)
-    interval_select.set_enabled(not manual_mode and state.ai_trigger_mode == "time")
-    words_num.set_enabled(not manual_mode and state.ai_trigger_mode == "words")
+    trigger_select.set_enabled(auto_mode)
+    interval_select.set_enabled(auto_mode and state.ai_trigger_mode == "time")
+    words_num.set_enabled(auto_mode and state.ai_trigger_mode == "words")
 
 
 def _on_trigger_changed(state: AppState, trigger_mode: str, interval_select, words_num):
     """Handle trigger mode change."""
-    state.ai_trigger_mode = trigger_mode.lower()
+    mode = trigger_mode.lower()
+    state.ai_trigger_mode = mode
+    interval_select.set_visibility(mode == "time")
+    words_num.set_visibility(mode == "words")
 
-    if trigger_mode == "Time":
-        interval_select.set_visibility(True)
-        words_num.set_visibility(False)
-    else:  # Words
-        interval_select.set_visibility(False)
-        words_num.set_visibility(True)
 
+@functools.lru_cache(maxsize=32)
+def _voice_display_name(filename: str) -> str:
+    """Shorten a voice file name for the sidebar label."""
+    return filename[:20] + "..." if len(filename) > 20 else filename
 
-def _on_tts_source_changed(state: AppState, source: str, checked: bool, w_cb, a_cb, t_cb):
-    """Handle TTS source selection (mutually exclusive)."""
-    if not checked:
-        return
 
-    state.tts_source = source
-    w_cb.value = (source == "whisper")
-    a_cb.value = (source == "ai")
-    t_cb.value = (source == "translation")
+def _persist_voice(source, filename: str, tts_controller) -> str:
+    """Save an uploaded voice clip into tts_voices/ and load it (worker thread)."""
+    _TTS_VOICE_DIR.mkdir(exist_ok=True)
+    permanent_path = _TTS_VOICE_DIR / filename
+
+    # Stream the upload in chunks so the whole clip is never copied in
+    # one go, then swap the finished copy in so a partial file is never
+    # picked up
+    partial_path = permanent_path.with_name(permanent_path.name + '.part')
+    source.seek(0)
+    with open(partial_path, 'wb') as dst:
+        shutil.copyfileobj(source, dst, length=_COPY_CHUNK_SIZE)
+    os.replace(partial_path, permanent_path)
+
+    if tts_controller:
+        tts_controller.set_reference_voice(str(permanent_path))
+    return str(permanent_path)
 
 
-def _on_voice_upload(event, state: AppState, bridge: ProcessingBridge, voice_label):
+async def _on_voice_upload(event, state: AppState, bridge: ProcessingBridge, voice_label):
     """Handle voice file upload."""
     try:
-        # Get uploaded file
-        file_path = event.name
-        filename = Path(file_path).name
-
-        # Set voice reference
-        state.tts_voice_reference = file_path
-        state.tts_voice_display_name = filename[:20] + "..." if len(filename) > 20 else filename
+        # event.name is the filename the browser sent, not a server path;
+        # keep only its last component so it cannot escape tts_voices/
+        filename = Path(event.name.replace('\\', '/')).name
+        if filename in ('', '.', '..'):
+            raise ValueError("upload has no usable filename")
+
+        # The uploaded bytes are in event.content; write them to a
+        # permanent location off the event loop and reference that copy
+        state.tts_voice_reference = await run.io_bound(
+            _persist_voice, event.content, filename, bridge.tts_controller)
+        state.tts_voice_display_name = _voice_display_name(filename)
         voice_label.text = state.tts_voice_display_name
 
-        if bridge.tts_controller:
-            # The file is saved by NiceGUI in a temporary location
-            # We need to use the actual uploaded content
-            with open(event.name, 'rb') as f:
-                content = f.read()
-
-            # Save to permanent location
-            tts_voice_dir = Path("tts_voices")
-            tts_voice_dir.mkdir(exist_ok=True)
-            permanent_path = tts_voice_dir / filename
-
-            with open(permanent_path, 'wb') as f:
-                f.write(content)
-
-            bridge.tts_controller.set_reference_voice(str(permanent_path))
-            state.tts_voice_reference = str(permanent_path)
-
         ui.notify(f"Voice loaded: {filename}", type='positive')
     except Exception as e:
         ui.notify(f"Error loading voice: {e}", type='negative')
@@ -878,18 +1028,28 @@ def sync_text_layout(state: AppState, sidebar_container, *, notify: bool = False
         ui.notify(f'Text panels {"shown" if state.text_visible else "hidden"}')
 
 
+def init_native_window():
+    """Resolve and cache the native pywebview window (None in browser mode)."""
+    if _MAIN_WINDOW[0] is None:
+        _MAIN_WINDOW[0] = getattr(app.native, 'main_window', None)
+    return _MAIN_WINDOW[0]
+
+
 def _resize_native_window(text_visible: bool):
     """Resize native pywebview window to match sidebar/text mode."""
+    window = _MAIN_WINDOW[0] or init_native_window()
+    if window is None:
+        return
+    target_width = 1200 if text_visible else 420
+    if _MAIN_WINDOW[1] == target_width:
+        return
     try:
-        window = getattr(app.native, 'main_window', None)
-        if not window:
-            return
-        target_width = 1200 if text_visible else 420
-        current_height = getattr(window, 'height', 800) or 800
-        window.resize(target_width, current_height)
-    except Exception:
-        # Ignore resize errors in browser mode or unsupported backends
+        window.resize(target_width, getattr(window, 'height', 800) or 800)
+    except Exception as e:
+        # Unsupported backend or window already closed
+        print(f"Window resize failed: {e}")
         return
+    _MAIN_WINDOW[1] = target_width
 
 
 def _set_section_visual_state(section, enabled: bool):
@@ -902,21 +1062,11 @@ def _set_section_visual_state(section, enabled: bool):
         section.classes(add='section-muted')
 
 
-def _set_controls_enabled(controls, enabled: bool):
-    """Enable or disable a list of controls."""
-    for ctrl in controls:
-        if ctrl is None:
-            continue
-        try:
+def _set_controls_enabled(section, enabled: bool):
+    """Enable or disable every input control inside a section container."""
+    for ctrl in section.descendants():
+        if isinstance(ctrl, _SECTION_CONTROL_TYPES):
             ctrl.set_enabled(enabled)
-        except AttributeError:
-            try:
-                (ctrl.enable() if enabled else ctrl.disable())
-            except AttributeError:
-                if enabled:
-                    ctrl.props(remove='disable')
-                else:
-                    ctrl.props('disable')
 
 
 def _clear_file_list(state: AppState, bridge: ProcessingBridge, file_list_label, update_fn):
@@ -951,13 +1101,13 @@ def _stop_file_transcription(state: AppState, bridge: ProcessingBridge, start_bt
     ui.notify("File transcription stopped")
 
 
+@functools.lru_cache(maxsize=256)
 def _format_time(seconds: float) -> str:
     """Format seconds as M:SS or H:MM:SS."""
     if seconds is None:
         return "end"
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
     if hours > 0:
         return f"{hours}:{minutes:02d}:{secs:02d}"
     return f"{minutes}:{secs:02d}"
@@ -971,31 +1121,28 @@ def _parse_time_input(value: str, state: AppState, field: str):
         state: AppState to update
         field: 'start' or 'end'
     """
-    if not value or value.lower() == 'end':
+    value = (value or '').strip().lower()
+    if not value or value == 'end':
         if field == 'end':
             state.file_end_time = None
         return
 
-    try:
-        parts = value.split(':')
-        if len(parts) == 2:
-            # M:SS format
-            minutes, seconds = int(parts[0]), int(parts[1])
-            total_seconds = minutes * 60 + seconds
-        elif len(parts) == 3:
-            # H:MM:SS format
-            hours, minutes, seconds = int(parts[0]), int(parts[1]), int(parts[2])
-            total_seconds = hours * 3600 + minutes * 60 + seconds
-        else:
-            # Try parsing as seconds
+    m = _TIME_RE.match(value)
+    if m:
+        # M:SS or H:MM:SS format
+        hours, minutes, seconds = m.groups()
+        total_seconds = int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+    else:
+        # Plain seconds
+        try:
             total_seconds = float(value)
+        except ValueError:
+            return  # Invalid format, ignore
 
-        if field == 'start':
-            state.file_start_time = max(0.0, total_seconds)
-        else:
-            state.file_end_time = total_seconds if total_seconds > 0 else None
-    except (ValueError, IndexError):
-        pass  # Invalid format, ignore
+    if field == 'start':
+        state.file_start_time = max(0.0, total_seconds)
+    else:
+        state.file_end_time = total_seconds if total_seconds > 0 else None
 
 
 def _apply_recovery(state: AppState, bridge: ProcessingBridge, recovery_row, update_fn):
@@ -4,6 +4,7 @@ Whispering NiceGUI Application
 Main entry point for the NiceGUI-based UI
 """
 
+import importlib.util
 import os
 import sys
 from pathlib import Path
@@ -11,15 +12,75 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from nicegui import app, ui
-import core
+from nicegui import app, run, ui
 from settings import Settings
-from whispering_ui.state import AppState
+from whispering_ui.state import AppState, get_ai_config
 from whispering_ui.bridge import ProcessingBridge
-from whispering_ui.components.sidebar import create_sidebar, sync_text_layout
+from whispering_ui.components.sidebar import create_sidebar, init_native_window, sync_text_layout
 from whispering_ui.components.output import create_output_panels
-from debug import set_debug_enabled
-from session_logger import SessionLogger
+from debug import debug_print, set_debug_enabled
+
+
+# Persisted settings as (state attribute, settings key, default)
+_CORE_SETTINGS = (
+    ("debug_enabled", "debug_enabled", False),
+    ("text_visible", "text_visible", False),
+    ("model", "model", "large-v3"),
+    ("vad_enabled", "vad", True),
+    ("para_detect_enabled", "para_detect", True),
+    ("device", "device", "cuda"),
+    ("memory", "memory", 3),
+    ("patience", "patience", 5.0),
+    ("timeout", "timeout", 5.0),
+    ("source_language", "source_language", "auto"),
+    ("target_language", "target_language", "none"),
+    ("autotype_mode", "autotype", "Off"),
+    ("auto_stop_enabled", "auto_stop_enabled", False),
+    ("auto_stop_minutes", "auto_stop_minutes", 5),
+    ("voice_commands_enabled", "voice_commands_enabled", False),
+)
+
+_AI_SETTINGS = (
+    ("ai_enabled", "ai_enabled", False),
+    ("ai_persona_index", "ai_persona_index", 0),
+    ("ai_model_index", "ai_model_index", 0),
+    ("ai_translate", "ai_translate", False),
+    ("ai_translate_only", "ai_translate_only", False),
+    ("ai_manual_mode", "ai_manual_mode", False),
+    ("ai_trigger_mode", "ai_trigger_mode", "time"),
+    ("ai_process_interval", "ai_process_interval", 20),
+    ("ai_process_words", "ai_process_words", 150),
+)
+
+_TTS_SETTINGS = (
+    ("tts_enabled", "tts_enabled", False),
+    ("tts_backend", "tts_backend", "chatterbox"),
+    ("tts_source", "tts_source", "whisper"),
+    ("tts_auto_play", "tts_auto_play", True),
+    ("tts_save_file", "tts_save_file", False),
+    ("tts_format", "tts_format", "wav"),
+    ("tts_qwen3_speaker", "tts_qwen3_speaker", "Ryan"),
+    ("tts_qwen3_model_size", "tts_qwen3_model_size", "1.7B"),
+    ("tts_kokoro_voice", "tts_kokoro_voice", "af_heart"),
+)
+
+
+def _apply_settings(state: AppState, settings: Settings, table):
+    """Copy one settings table onto the state in a single lookup pass."""
+    values = settings.get_many({key: default for _, key, default in table})
+    for attr, key, _ in table:
+        value = values[key]
+        # Strings parsed from JSON are fresh objects; interning them lets the
+        # mode checks against literals ("Off", "ai", "time") hit the identity
+        # fast path in str.__eq__.
+        if isinstance(value, str):
+            value = sys.intern(value)
+        setattr(state, attr, value)
+
+
+def _collect_settings(state: AppState, table) -> dict:
+    """Read one settings table back off the state, keyed by settings name."""
+    return {key: getattr(state, attr) for attr, key, _ in table}
 
 
 def main():
@@ -33,54 +94,22 @@ def main():
     state = AppState()
 
     # Apply loaded settings to state
-    state.debug_enabled = settings.get("debug_enabled", False)
+    _apply_settings(state, settings, _CORE_SETTINGS)
     set_debug_enabled(state.debug_enabled)
-    state.text_visible = settings.get("text_visible", False)
-    state.model = settings.get("model", "large-v3")
-    state.vad_enabled = settings.get("vad", True)
-    state.para_detect_enabled = settings.get("para_detect", True)
-    state.device = settings.get("device", "cuda")
-    state.memory = settings.get("memory", 3)
-    state.patience = settings.get("patience", 5.0)
-    state.timeout = settings.get("timeout", 5.0)
-    state.source_language = settings.get("source_language", "auto")
-    state.target_language = settings.get("target_language", "none")
 
     # Handle autotype setting - convert legacy boolean to string if needed
-    autotype_val = settings.get("autotype", "Off")
-    if isinstance(autotype_val, bool):
+    if isinstance(state.autotype_mode, bool):
         state.autotype_mode = "Off"  # Convert old boolean format to new string format
-    else:
-        state.autotype_mode = autotype_val
-
-    state.auto_stop_enabled = settings.get("auto_stop_enabled", False)
-    state.auto_stop_minutes = settings.get("auto_stop_minutes", 5)
-    state.voice_commands_enabled = settings.get("voice_commands_enabled", False)
-
-    # Initialize microphone list
-    try:
-        state.mic_list = core.get_mic_names()
-    except Exception as e:
-        print(f"Error getting mic list: {e}")
-        state.mic_list = []
 
     # Check AI availability
     try:
-        from ai_config import load_ai_config
-        ai_config = load_ai_config()
+        # Cached for the process, so the sidebar and bridge reuse this load
+        ai_config = get_ai_config()
         state.ai_available = ai_config is not None
 
         if state.ai_available:
             # Load AI settings
-            state.ai_enabled = settings.get("ai_enabled", False)
-            state.ai_persona_index = settings.get("ai_persona_index", 0)
-            state.ai_model_index = settings.get("ai_model_index", 0)
-            state.ai_translate = settings.get("ai_translate", False)
-            state.ai_translate_only = settings.get("ai_translate_only", False)
-            state.ai_manual_mode = settings.get("ai_manual_mode", False)
-            state.ai_trigger_mode = settings.get("ai_trigger_mode", "time")
-            state.ai_process_interval = settings.get("ai_process_interval", 20)
-            state.ai_process_words = settings.get("ai_process_words", 150)
+            _apply_settings(state, settings, _AI_SETTINGS)
     except Exception as e:
         print(f"AI features not available: {e}")
         state.ai_available = False
@@ -91,7 +120,6 @@ def main():
     # tts_backends_available tracks which engines are actually installed.
     try:
         from tts_provider import get_available_backends
-        from tts_controller import TTSController
 
         backends = get_available_backends()
         state.tts_backends_available = backends
@@ -99,15 +127,7 @@ def main():
         state.tts_available = True
 
         # Load TTS settings
-        state.tts_enabled = settings.get("tts_enabled", False)
-        state.tts_backend = settings.get("tts_backend", "chatterbox")
-        state.tts_source = settings.get("tts_source", "whisper")
-        state.tts_auto_play = settings.get("tts_auto_play", True)
-        state.tts_save_file = settings.get("tts_save_file", False)
-        state.tts_format = settings.get("tts_format", "wav")
-        state.tts_qwen3_speaker = settings.get("tts_qwen3_speaker", "Ryan")
-        state.tts_qwen3_model_size = settings.get("tts_qwen3_model_size", "1.7B")
-        state.tts_kokoro_voice = settings.get("tts_kokoro_voice", "af_heart")
+        _apply_settings(state, settings, _TTS_SETTINGS)
 
         # If saved backend is not installed, fall back to first available
         if not backends.get(state.tts_backend):
@@ -116,13 +136,10 @@ def main():
                     state.tts_backend = name
                     break
 
-        # Print backend status
-        has_any = False
+        # Print backend status (debug only; the sidebar shows it too)
+        has_any = any(backends.values())
         for name, avail in backends.items():
-            status = "available" if avail else "not installed"
-            print(f"  TTS backend {name}: {status}")
-            if avail:
-                has_any = True
+            debug_print(f"  TTS backend {name}: {'available' if avail else 'not installed'}")
         if not has_any:
             state.tts_enabled = False  # Don't auto-enable if nothing is installed
             print("  No TTS backends installed.")
@@ -135,14 +152,27 @@ def main():
         state.tts_available = False
         state.tts_backends_available = {}
 
+    # Feature availability is settled now, so fix the set of persisted settings
+    persisted_settings = _CORE_SETTINGS
+    if state.ai_available:
+        persisted_settings += _AI_SETTINGS
+    if state.tts_available:
+        persisted_settings += _TTS_SETTINGS
+
     # Create processing bridge
     bridge = ProcessingBridge(state)
 
-    # Initialize TTS controller in bridge if any backend is available
-    if state.tts_available and any(state.tts_backends_available.values()):
-        try:
+    # Initialize TTS controller in bridge if any backend is available.
+    # tts_controller pulls in the audio stack, so it is imported and built
+    # off the event loop once the app is up; until then bridge.tts_controller
+    # stays None, which every caller already treats as "TTS not ready".
+    async def _deferred_tts_init():
+        if not (state.tts_available and any(state.tts_backends_available.values())):
+            return
+
+        def build():
             from tts_controller import TTSController
-            bridge.tts_controller = TTSController(
+            return TTSController(
                 device="auto",
                 output_dir="tts_output",
                 backend=state.tts_backend,
@@ -150,39 +180,59 @@ def main():
                 qwen3_speaker=state.tts_qwen3_speaker,
                 kokoro_voice=state.tts_kokoro_voice,
             )
-            # Wire up status callbacks
-            bridge.tts_controller.on_progress = lambda msg: setattr(state, 'tts_status_message', msg)
-            bridge.tts_controller.on_error = lambda msg: setattr(state, 'tts_status_message', msg)
+
+        try:
+            controller = await run.io_bound(build)
         except Exception as e:
             print(f"Failed to initialize TTS controller: {e}")
+            return
+        # Wire up status callbacks
+        controller.on_progress = lambda msg: setattr(state, 'tts_status_message', msg)
+        controller.on_error = lambda msg: setattr(state, 'tts_status_message', msg)
+        bridge.tts_controller = controller
+
+    app.on_startup(_deferred_tts_init)
 
     # === RECOVERY DIALOG ===
     # Check for crashed sessions and offer recovery
     def check_crashed_sessions():
         """Check for crashed sessions and show recovery dialog."""
         try:
-            from session_logger import SessionLogger
-            logger = SessionLogger()
+            # Reuse the bridge's logger rather than building a second one
+            logger = bridge.session_logger
             temp_files = logger.scan_for_temp_files()
-            
-            if temp_files:
-                # Show recovery dialog for each crashed session
-                for temp_file, timestamp in temp_files:
-                    with ui.dialog() as dialog, ui.card().classes('w-96'):
-                        ui.label(f'Found incomplete session from {timestamp}').classes('text-lg font-bold mb-4')
-                        ui.label('Would you like to recover this session or discard it?').classes('mb-4')
-                        
-                        with ui.row().classes('justify-center gap-4 mt-4'):
-                            ui.button('Recover', on_click=lambda: recover_session(temp_file, logger, dialog)).props('color=primary')
-                            ui.button('Discard', on_click=lambda: discard_session(temp_file, logger, dialog)).props('color=negative')
-                        
-                        ui.label('Note: Recovery will save the session to logs.').classes('text-xs text-gray-500 mt-2')
-                    
-                    dialog.open()
+            if not temp_files:
+                return
+
+            # One dialog, stepped through the crashed sessions in turn
+            pending = iter(temp_files)
+            current = [None]
+
+            # Persistent: Esc or a backdrop click must not skip the remaining sessions
+            with ui.dialog().props('persistent') as dialog, ui.card().classes('w-96'):
+                title_label = ui.label('').classes('text-lg font-bold mb-4')
+                ui.label('Would you like to recover this session or discard it?').classes('mb-4')
+
+                with ui.row().classes('justify-center gap-4 mt-4'):
+                    ui.button('Recover', on_click=lambda: (recover_session(current[0], logger), advance())).props('color=primary')
+                    ui.button('Discard', on_click=lambda: (discard_session(current[0], logger), advance())).props('color=negative')
+
+                ui.label('Note: Recovery will save the session to logs.').classes('text-xs text-gray-500 mt-2')
+
+            def advance():
+                entry = next(pending, None)
+                if entry is None:
+                    dialog.close()
+                    return
+                current[0], timestamp = entry
+                title_label.text = f'Found incomplete session from {timestamp}'
+                dialog.open()
+
+            advance()
         except Exception as e:
             print(f"Error checking crashed sessions: {e}")
 
-    def recover_session(temp_file, logger, dialog):
+    def recover_session(temp_file, logger):
         """Recover a crashed session and load text into UI."""
         try:
             # First, load the outputs from the temp file before renaming
@@ -197,154 +247,38 @@ def main():
                     state.ai_text = outputs.get("ai_text", "")
                     state.translation_text = outputs.get("translation_text", "")
                     ui.notify('✓ Session recovered and text restored', type='positive')
-                    print(f"Recovered session with text: {final_file}")
+                    debug_print(f"Recovered session with text: {final_file}")
                 else:
                     ui.notify('✓ Session recovered (no text content)', type='positive')
-                    print(f"Recovered session (empty): {final_file}")
+                    debug_print(f"Recovered session (empty): {final_file}")
             else:
                 ui.notify('✗ Failed to recover session', type='negative')
         except Exception as e:
             ui.notify(f'✗ Recovery error: {e}', type='negative')
             print(f"Recovery error: {e}")
-        finally:
-            dialog.close()
 
-    def discard_session(temp_file, logger, dialog):
+    def discard_session(temp_file, logger):
         """Discard a crashed session."""
         try:
             success = logger.discard_session(temp_file)
             if success:
                 ui.notify('✓ Session discarded', type='positive')
-                print(f"Discarded session: {temp_file}")
+                debug_print(f"Discarded session: {temp_file}")
             else:
                 ui.notify('✗ Failed to discard session', type='negative')
         except Exception as e:
             ui.notify(f'✗ Discard error: {e}', type='negative')
             print(f"Discard error: {e}")
-        finally:
-            dialog.close()
 
     # === UI SETUP ===
+    app.add_static_files('/static', str(Path(__file__).parent / 'static'))
     ui.page_title('Whispering')
 
     # Enable dark mode
     ui.dark_mode().enable()
 
-    # Add custom CSS for compact, modern dark theme
-    ui.add_head_html('''
-        <style>
-            /* Compact spacing */
-            .q-page {
-                padding: 0 !important;
-            }
-
-            .workspace-row {
-                transition: max-width 0.25s ease;
-            }
-
-            .workspace-row.workspace-collapsed {
-                max-width: 420px;
-                margin: 0 auto;
-            }
-
-            /* Sidebar - fixed width, dark background */
-            .sidebar-container {
-                background: #1e1e1e;
-                border-right: 1px solid #333;
-                overflow-y: auto;
-                min-width: 350px !important;
-                max-width: 350px !important;
-            }
-
-            /* Output panels - take remaining space */
-            .output-container {
-                background: #121212;
-                flex: 1;
-                display: flex;
-                flex-direction: column;
-                min-height: 0;
-                height: 100%;
-                overflow: hidden;
-                padding: 0;
-            }
-
-            .output-stack {
-                display: flex;
-                flex-direction: column;
-                gap: 0.35rem;
-                flex: 1;
-                min-height: 0;
-                height: 100%;
-                width: 100%;
-                padding: 0.4rem 0.5rem 0.4rem 0.4rem;
-            }
-
-            .output-panel {
-                background: #181818;
-                border: 1px solid #2a2a2a;
-                border-radius: 8px;
-                padding: 0.35rem 0.55rem 0.3rem;
-                display: flex;
-                flex-direction: column;
-                min-height: 0;
-                flex: 1 1 0;
-                width: 100%;
-            }
-
-            .output-panel .panel-header {
-                display: flex;
-                align-items: center;
-                justify-content: space-between;
-                margin-bottom: 0.05rem;
-            }
-
-            .output-panel .output-richtext {
-                flex: 1 1 0;
-                min-height: 0;
-                height: 100%;
-                width: 100%;
-            }
-
-            .output-richtext {
-                flex: 1 1 0;
-                min-height: 0;
-                width: 100%;
-                height: 100%;
-            }
-
-            .section-muted {
-                opacity: 0.65;
-            }
-
-            /* Compact controls */
-            .q-field__control {
-                min-height: 32px !important;
-            }
-
-            .q-btn {
-                font-size: 0.875rem !important;
-            }
-
-            /* Section separators */
-            .q-separator {
-                background: #333 !important;
-            }
-
-            /* Scrollbars */
-            ::-webkit-scrollbar {
-                width: 8px;
-            }
-
-            ::-webkit-scrollbar-track {
-                background: #1e1e1e;
-            }
-
-            ::-webkit-scrollbar-thumb {
-                background: #444;
-                border-radius: 4px;
-            }
-        </style>
-    ''')
+    # Custom CSS for compact, modern dark theme (served as a cacheable file)
+    ui.add_head_html('<link rel="stylesheet" href="/static/whispering.css">')
 
     # === UI LAYOUT ===
     # Horizontal split: sidebar (left) | output panels (right)
@@ -362,6 +296,19 @@ def main():
         # Set initial visibility
         sync_text_layout(state, sidebar_container, notify=False)
 
+    # Resolve the native window handle once the app is up
+    app.on_startup(init_native_window)
+
+    # Enumerate microphones once the app is up; device probing can take
+    # hundreds of ms, and the sidebar's mic select follows state.mic_list
+    async def _deferred_mic_scan():
+        try:
+            await run.io_bound(bridge.refresh_mics)
+        except Exception as e:
+            print(f"Error getting mic list: {e}")
+
+    app.on_startup(_deferred_mic_scan)
+
     # === SAVE SETTINGS ON EXIT ===
     def save_settings_on_exit():
         """Save settings before application closes."""
@@ -371,45 +318,8 @@ def main():
         if state.is_recording:
             bridge.stop_recording()
 
-        # Save all settings
-        settings.set("text_visible", state.text_visible)
-        settings.set("debug_enabled", state.debug_enabled)
-        settings.set("model", state.model)
-        settings.set("vad", state.vad_enabled)
-        settings.set("para_detect", state.para_detect_enabled)
-        settings.set("device", state.device)
-        settings.set("memory", state.memory)
-        settings.set("patience", state.patience)
-        settings.set("timeout", state.timeout)
-        settings.set("source_language", state.source_language)
-        settings.set("target_language", state.target_language)
-        settings.set("autotype", state.autotype_mode)
-        settings.set("auto_stop_enabled", state.auto_stop_enabled)
-        settings.set("auto_stop_minutes", state.auto_stop_minutes)
-        settings.set("voice_commands_enabled", state.voice_commands_enabled)
-
-        if state.ai_available:
-            settings.set("ai_enabled", state.ai_enabled)
-            settings.set("ai_persona_index", state.ai_persona_index)
-            settings.set("ai_model_index", state.ai_model_index)
-            settings.set("ai_translate", state.ai_translate)
-            settings.set("ai_translate_only", state.ai_translate_only)
-            settings.set("ai_manual_mode", state.ai_manual_mode)
-            settings.set("ai_trigger_mode", state.ai_trigger_mode)
-            settings.set("ai_process_interval", state.ai_process_interval)
-            settings.set("ai_process_words", state.ai_process_words)
-
-        if state.tts_available:
-            settings.set("tts_enabled", state.tts_enabled)
-            settings.set("tts_backend", state.tts_backend)
-            settings.set("tts_source", state.tts_source)
-            settings.set("tts_auto_play", state.tts_auto_play)
-            settings.set("tts_save_file", state.tts_save_file)
-            settings.set("tts_format", state.tts_format)
-            settings.set("tts_qwen3_speaker", state.tts_qwen3_speaker)
-            settings.set("tts_qwen3_model_size", state.tts_qwen3_model_size)
-            settings.set("tts_kokoro_voice", state.tts_kokoro_voice)
-
+        # Save all settings in one batch, driven by the same tables as loading
+        settings.update(_collect_settings(state, persisted_settings))
         settings.save()
 
     # Register cleanup handler
@@ -422,12 +332,12 @@ def main():
     # === RUN APPLICATION ===
     # Try native mode first, fall back to browser if backend unavailable
     native_mode = False
-    try:
-        # Check if PyQt6 is available (easiest backend for pywebview)
-        import PyQt6
+    # Check if PyQt6 is available (easiest backend for pywebview) without
+    # importing it; pywebview loads it itself once the window starts
+    if importlib.util.find_spec("PyQt6") is not None:
         native_mode = True
         print("\n🚀 Starting Whispering in native window mode...")
-    except ImportError:
+    else:
         print("\n⚠️  PyQt6 not found. Running in browser mode.")
         print("   For native window, install: pip install PyQt6 PyQt6-WebEngine")
         print("   Starting web interface at http://127.0.0.1:8000\n")
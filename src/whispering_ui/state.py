@@ -4,11 +4,27 @@ Application State Model
 Holds all application state without UI dependencies
 """
 
+import functools
 from dataclasses import dataclass, field
-from typing import Optional, List, Tuple
+from typing import Callable, Dict, Iterable, Optional, List, Tuple, Union
 
 
-@dataclass
+# Text buffers whose character/word counts are shown in the output panels
+_TEXT_FIELDS = ('whisper_text', 'ai_text', 'translation_text')
+
+
+@functools.lru_cache(maxsize=1)
+def get_ai_config():
+    """Load the AI configuration once per process (None if unavailable)."""
+    try:
+        from ai_config import load_ai_config
+        return load_ai_config()
+    except Exception as e:
+        print(f"Error loading AI config: {e}")
+        return None
+
+
+@dataclass(slots=True, kw_only=True)
 class AppState:
     """Application state data model - decoupled from UI framework."""
 
@@ -39,6 +55,8 @@ class AppState:
     ai_trigger_mode: str = "time"  # "time" or "words"
     ai_process_interval: int = 20  # seconds
     ai_process_words: int = 150
+    ai_persona_names: List[str] = field(default_factory=list)  # Cached from ai_config
+    ai_model_names: List[str] = field(default_factory=list)  # Cached from ai_config
 
     # === TTS Settings ===
     tts_enabled: bool = False
@@ -73,6 +91,7 @@ class AppState:
     audio_level: int = 0
     error_message: Optional[str] = None
     status_message: str = ""
+    status_display: str = ""  # Bounded status line, derived from the two above
 
     # === File Transcription State ===
     file_transcription_mode: bool = False  # True when transcribing from files
@@ -116,43 +135,82 @@ class AppState:
     ai_available: bool = False
     tts_available: bool = False
 
-    def get_whisper_count(self) -> Tuple[int, int]:
-        """Get character and word count for Whisper text."""
-        text = self.whisper_text.strip()
-        char_count = len(text)
-        word_count = len(text.split()) if text else 0
-        return char_count, word_count
-
-    def get_ai_count(self) -> Tuple[int, int]:
-        """Get character and word count for AI text."""
-        text = self.ai_text.strip()
+    # === Change Listeners ===
+    _listeners: Dict[str, List[Callable[[], None]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+
+    # (chars, words) per text buffer, recomputed only when the buffer changes
+    _text_counts: Dict[str, Tuple[int, int]] = field(
+        default_factory=lambda: dict.fromkeys(_TEXT_FIELDS, (0, 0)),
+        init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.subscribe(('error_message', 'status_message'), self._update_status_display)
+        for name in _TEXT_FIELDS:
+            self.subscribe(name, functools.partial(self._recount_text, name))
+
+    def _update_status_display(self):
+        """Recompute the bounded status line shown under the level meter."""
+        if self.error_message:
+            self.status_display = f'Error: {self.error_message[:40]}'
+        else:
+            self.status_display = (self.status_message or '')[:40]
+
+    def __setattr__(self, name, value):
+        listeners = getattr(self, '_listeners', None)
+        if not listeners or name not in listeners:
+            object.__setattr__(self, name, value)
+            return
+
+        changed = getattr(self, name, None) != value
+        object.__setattr__(self, name, value)
+        if changed:
+            for callback in listeners[name]:
+                callback()
+
+    def subscribe(self, names: Union[str, Iterable[str]], callback: Callable[[], None]):
+        """Call callback() whenever one of the named fields changes value."""
+        if isinstance(names, str):
+            names = (names,)
+        for name in names:
+            self._listeners.setdefault(name, []).append(callback)
+
+    def reload_ai_config(self):
+        """Re-read the AI configuration from disk and refresh the cached names.
+
+        Called by the bridge each time recording starts with AI enabled.
+        """
+        get_ai_config.cache_clear()
+        ai_config = get_ai_config()
+        self.ai_persona_names = [p['name'] for p in ai_config.get_personas()] if ai_config else []
+        self.ai_model_names = [m['name'] for m in ai_config.get_models()] if ai_config else []
+
+    def _recount_text(self, name: str):
+        """Refresh the cached counts for one text buffer after it changes."""
+        text = getattr(self, name).strip()
         char_count = len(text)
         word_count = len(text.split()) if text else 0
-        return char_count, word_count
+        self._text_counts[name] = (char_count, word_count)
 
-    def get_translation_count(self) -> Tuple[int, int]:
-        """Get character and word count for Translation text."""
-        text = self.translation_text.strip()
-        char_count = len(text)
-        word_count = len(text.split()) if text else 0
-        return char_count, word_count
+    def get_text_count(self, name: str) -> Tuple[int, int]:
+        """Get character and word count for one text buffer (e.g. 'whisper_text')."""
+        return self._text_counts[name]
 
     def get_current_ai_task_name(self) -> str:
         """Get the current AI task name for display."""
         if not self.ai_enabled or not self.ai_available:
             return ""
         
-        try:
-            from ai_config import load_ai_config
-            ai_config = load_ai_config()
+        # Names are cached on the state; reload_ai_config() refreshes them
+        if not self.ai_persona_names:
+            ai_config = get_ai_config()
             if not ai_config:
                 return ""
-            
-            personas = ai_config.get_personas()
-            if self.ai_persona_index < len(personas):
-                persona = personas[self.ai_persona_index]
-                return persona.get('name', 'Unknown')
-        except Exception:
-            pass
-        
+            try:
+                self.ai_persona_names = [p.get('name', 'Unknown') for p in ai_config.get_personas()]
+            except Exception:
+                return ""
+
+        if self.ai_persona_index < len(self.ai_persona_names):
+            return self.ai_persona_names[self.ai_persona_index]
         return ""